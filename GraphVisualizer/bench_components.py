@@ -0,0 +1,72 @@
+"""Time the serial and process-pool component algorithms on a random graph.
+
+Usage: python bench_components.py [nodes] [edges]
+"""
+import contextlib
+import os
+import random
+import sys
+import threading
+import time
+
+from graph import Graph
+from parallel import parallel_connected_components, parallel_scc
+
+
+def random_graph(node_count, edge_count, directed, seed=0):
+    rng = random.Random(seed)
+    graph = Graph(directed=directed)
+    for node in range(node_count):
+        graph.add_node(f"node_{node}")  # Same ids as the GUI creates
+    for _ in range(edge_count):
+        graph.add_edge(f"node_{rng.randrange(node_count)}", f"node_{rng.randrange(node_count)}")
+    return graph
+
+
+def run_serial(method):
+    """Run one of the recursive serial methods on a thread with a stack deep enough for big graphs."""
+    result = []
+    sys.setrecursionlimit(10 ** 7)
+    threading.stack_size(512 * 1024 * 1024)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):  # They print every component
+        worker = threading.Thread(target=lambda: result.append(method()))
+        worker.start()
+        worker.join()
+    return result[0]
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def partition(components):
+    return sorted(sorted(component) for component in components)
+
+
+def main():
+    node_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    edge_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000000
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    print(f"{node_count} nodes, {edge_count} edges, {cores} cores available")
+
+    for name, directed, serial, parallel in (
+            ("connected components", False, Graph.find_connected_components, parallel_connected_components),
+            ("strongly connected components", True, Graph.kosaraju, parallel_scc)):
+        graph = random_graph(node_count, edge_count, directed)
+        serial_time, expected = timed(lambda: run_serial(lambda: serial(graph)))
+        print(f"{name}: serial {serial_time:.2f}s")
+        for processes in (1, 2, 4, 8):
+            # CPU time of this process is the serial part; the rest of the work runs in the workers
+            parent_start = time.process_time()
+            parallel_time, components = timed(lambda: parallel(graph, processes))
+            parent_time = time.process_time() - parent_start
+            assert partition(components) == partition(expected), "partition differs from the serial method"
+            print(f"  {processes} processes: {parallel_time:.2f}s (parent CPU {parent_time:.2f}s), "
+                  f"speedup {serial_time / parallel_time:.2f}x"
+                  + (" (more processes than cores, not a parallel speedup)" if processes > cores else ""))
+
+
+if __name__ == '__main__':
+    main()
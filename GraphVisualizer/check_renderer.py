@@ -0,0 +1,69 @@
+"""Check that PNG rasterization handles arrowheads whose tips lie just outside the image.
+
+Usage: python check_renderer.py
+"""
+import math
+
+import numpy as np
+
+from graph import Graph
+from renderer import ARROW_SHAPE, GraphRenderer, _raster_triangles
+
+WIDTH, HEIGHT, RADIUS, EDGE_WIDTH = 800, 600, 20, 2
+
+
+def stray_pixels(start, end):
+    """Render one directed edge and return the black pixels that neither node nor the edge can explain."""
+    graph = Graph(directed=True)
+    graph.add_node("a")
+    graph.add_node("b")
+    graph.add_edge("a", "b")
+    renderer = GraphRenderer(graph, {"a": start, "b": end}, WIDTH, HEIGHT, RADIUS, edge_width=EDGE_WIDTH)
+    image = renderer.rasterize()
+    ys, xs = np.nonzero((image == 0).all(axis=2))
+    # Everything drawn lies within an arrowhead's reach of the segment or on a node outline
+    reach = math.hypot(ARROW_SHAPE[1], ARROW_SHAPE[2] + EDGE_WIDTH / 2) + EDGE_WIDTH + 1
+    points = np.column_stack((xs, ys)).astype(float)
+    start, end = np.array(start, dtype=float), np.array(end, dtype=float)
+    delta = end - start
+    t = np.clip((points - start) @ delta / (delta @ delta), 0, 1)
+    to_segment = np.hypot(*(points - start - t[:, None] * delta).T)
+    on_node = np.minimum(np.hypot(*(points - start).T), np.hypot(*(points - end).T)) <= RADIUS + 1
+    return points[(to_segment > reach) & ~on_node]
+
+
+def check_triangles_clipped(size=40):
+    """Triangles crossing each border of a mask must only mark pixels inside their own bounding box."""
+    corners = np.array([(0.0, 0.0), (12.0, 5.0), (4.0, 14.0)])
+    for x in range(-15, size + 1, 3):
+        for y in range(-15, size + 1, 3):
+            a, b, c = (corners + (x, y))[:, None, :]
+            ink = np.zeros((size, size), dtype=bool)
+            _raster_triangles(ink, a, b, c)
+            ys, xs = np.nonzero(ink)
+            assert ((xs >= x - 1) & (xs <= x + 13) & (ys >= y - 1) & (ys <= y + 15)).all(), \
+                f"triangle at {(x, y)} wrapped around"
+
+
+def main():
+    check_triangles_clipped()
+    cases = [((400, 650), (400, 590))]  # A node dragged below the canvas, pointing back into it
+    for outside in range(0, 3 * RADIUS):
+        # Arrow tips `outside` pixels past each border and each corner, pointing out of the image
+        # and back into it. Edges are trimmed by the node radius, so the end node lies past the tip.
+        tip = RADIUS + outside
+        cases += [((400, 300), (400, HEIGHT + tip)), ((400, 300), (400, -tip)),
+                  ((400, 300), (WIDTH + tip, 300)), ((400, 300), (-tip, 300)),
+                  ((400, 300), (WIDTH + tip, HEIGHT + tip)), ((400, 300), (-tip, -tip))]
+        tip = outside - RADIUS
+        cases += [((400, HEIGHT + 200), (400, HEIGHT + tip)), ((400, -200), (400, -tip)),
+                  ((WIDTH + 200, 300), (WIDTH + tip, 300)), ((-200, 300), (-tip, 300)),
+                  ((WIDTH + 200, HEIGHT + 200), (WIDTH + tip, HEIGHT + tip)), ((-200, -200), (-tip, -tip))]
+    for start, end in cases:
+        stray = stray_pixels(start, end)
+        assert len(stray) == 0, f"edge {start} -> {end} drew {len(stray)} pixels away from it, e.g. {stray[0]}"
+    print(f"{len(cases)} border cases rendered correctly")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,26 @@
+import math
+
+
 class Edge:
     def __init__(self, start_node, end_node, line_id):
         self.start_node = start_node
         self.end_node = end_node
         self.line_id = line_id
 
+
+def trim_edge(x1, y1, x2, y2, node_radius):
+    """Return the edge endpoints trimmed to the outer edge of both nodes, or None if the nodes overlap."""
+    dx = x2 - x1
+    dy = y2 - y1
+    distance = math.sqrt(dx ** 2 + dy ** 2)
+
+    # If the nodes are the same (distance is zero), there is nothing to draw
+    if distance == 0:
+        return None
+
+    # Unit vector (direction) from the start node to the end node
+    unit_dx = dx / distance
+    unit_dy = dy / distance
+
+    return (x1 + unit_dx * node_radius, y1 + unit_dy * node_radius,
+            x2 - unit_dx * node_radius, y2 - unit_dy * node_radius)
@@ -1,8 +1,8 @@
 import tkinter as tk
-from edge import Edge
+from edge import Edge, trim_edge
 from node import Node
 from graph import Graph
-import math
+from interaction import FrameScheduler
 import random
 from tkinter import messagebox
 
@@ -13,7 +13,7 @@ def random_color():
 
 
 class GraphGUI:
-    def __init__(self, graph, root=None):
+    def __init__(self, graph, root=None, report_frame_stats=False):
         self.graph = graph
         self.root = root if root else tk.Tk()
         self.canvas = tk.Canvas(self.root, width=800, height=600)
@@ -42,6 +42,8 @@ class GraphGUI:
         self.nodes = {}
         self.node_counter = 1
         self.mouse_drag_data = {"x": 0, "y": 0}  # mouse drag
+        self.scheduler = FrameScheduler(self.canvas)  # Coalesces drag updates to one per frame
+        self.report_frame_stats = report_frame_stats  # Print frame-time stats after every drag
 
         self.canvas.bind("<Button-2>", self.on_canvas_click)  # Middle click for selection
         self.canvas.bind("<B2-Motion>", self.on_canvas_drag)  # Middle click drag for movement
@@ -68,6 +70,15 @@ class GraphGUI:
         self.color_button = tk.Button(self.root, text="Topological Sort", command=self.color_topological_sort)
         self.color_button.pack(side=tk.LEFT, padx=2)
 
+        # Centrality selection menu and button to color nodes by it
+        self.centrality_var = tk.StringVar(value="PageRank")
+        self.centrality_menu = tk.OptionMenu(self.root, self.centrality_var,
+                                             "Degree", "PageRank", "Eigenvector", "Closeness")
+        self.centrality_menu.pack(side=tk.LEFT, padx=5)
+
+        self.centrality_button = tk.Button(self.root, text="Centrality", command=self.color_centrality)
+        self.centrality_button.pack(side=tk.LEFT, padx=5)
+
         self.check_button = tk.Button(self.root, text="Check Tree", command=self.check_tree_button)
         self.check_button.pack(side=tk.RIGHT, padx=5)
 
@@ -127,27 +138,13 @@ class GraphGUI:
         x1, y1 = edge.start_node.x, edge.start_node.y
         x2, y2 = edge.end_node.x, edge.end_node.y
 
-        # Calculate the distance between the nodes
-        dx = x2 - x1
-        dy = y2 - y1
-        distance = math.sqrt(dx ** 2 + dy ** 2)
+        # Adjust the endpoints of the lines to stop at the outer edge of the nodes
+        endpoints = trim_edge(x1, y1, x2, y2, self.node_radius)
 
         # If the nodes are the same (distance is zero), return without drawing the edge
-        if distance == 0:
+        if endpoints is None:
             return
-
-        # Calculate the unit vector (direction) from the start node to the end node
-        unit_dx = dx / distance
-        unit_dy = dy / distance
-
-        # Set the node radius
-        node_radius = 20  # Adjust this as needed
-
-        # Adjust the endpoints of the lines to stop at the outer edge of the nodes
-        x1_end = x1 + unit_dx * node_radius
-        y1_end = y1 + unit_dy * node_radius
-        x2_end = x2 - unit_dx * node_radius
-        y2_end = y2 - unit_dy * node_radius
+        x1_end, y1_end, x2_end, y2_end = endpoints
 
         # Draw the line (edge) between the nodes, using arrow for directed edges
         if self.graph.directed:
@@ -203,36 +200,52 @@ class GraphGUI:
     def on_canvas_drag(self, event):
         """Handle dragging a node when the middle mouse button is pressed."""
         if self.selected_node:
-            # Calculate distance moved from initial mouse position
-            delta_x = event.x - self.mouse_drag_data["x"]
-            delta_y = event.y - self.mouse_drag_data["y"]
+            # Only remember the latest pointer position; the move is applied once per frame
+            self.mouse_drag_data["target"] = (event.x, event.y)
+            self.scheduler.request("drag", self.apply_drag)
+
+    def apply_drag(self):
+        """Move the dragged node to the latest pointer position."""
+        target = self.mouse_drag_data.pop("target", None)
+        if self.selected_node is None or target is None:
+            return
+        # Calculate distance moved since the last applied frame
+        delta_x = target[0] - self.mouse_drag_data["x"]
+        delta_y = target[1] - self.mouse_drag_data["y"]
 
-            # Move the selected node
-            self.canvas.move(self.selected_node.circle_id, delta_x, delta_y)
-            self.canvas.move(self.selected_node.text_id, delta_x, delta_y)
+        # Update the node's position in the graph
+        node = self.selected_node
+        node.x += delta_x
+        node.y += delta_y
 
-            # Update the node's position in the graph
-            self.selected_node.x += delta_x
-            self.selected_node.y += delta_y
+        # Move the selected node
+        self.scheduler.coords(node.circle_id,
+                              node.x - self.node_radius, node.y - self.node_radius,
+                              node.x + self.node_radius, node.y + self.node_radius)
+        self.scheduler.coords(node.text_id, node.x, node.y)
 
-            # Update the mouse drag data
-            self.mouse_drag_data["x"] = event.x
-            self.mouse_drag_data["y"] = event.y
+        # Update the mouse drag data
+        self.mouse_drag_data["x"], self.mouse_drag_data["y"] = target
 
-            # Update edges connected to the node
-            self.update_edges(self.selected_node)
+        # Update edges connected to the node
+        self.update_edges(node)
 
     def on_canvas_release(self, event):
         """Stop dragging when the middle mouse button is released."""
+        self.scheduler.flush()  # Apply the last pending move before deselecting
+        if self.report_frame_stats and self.selected_node is not None and self.scheduler.frames:
+            print(f"Drag frame stats: {self.scheduler.stats()}")
+        self.scheduler.reset_stats()
         self.selected_node = None  # Deselect node after dragging ends
 
     def update_edges(self, node):
         """Update edges after dragging a node."""
         for edge in self.edges.values():
             if edge.start_node == node or edge.end_node == node:
-                self.canvas.coords(edge.line_id,
-                                   edge.start_node.x, edge.start_node.y,
-                                   edge.end_node.x, edge.end_node.y)
+                endpoints = trim_edge(edge.start_node.x, edge.start_node.y,
+                                      edge.end_node.x, edge.end_node.y, self.node_radius)
+                if endpoints is not None:
+                    self.scheduler.coords(edge.line_id, *endpoints)
 
     def is_within_node(self, x, y, node):
         """Check if the click is within the bounds of a node."""
@@ -398,6 +411,20 @@ class GraphGUI:
                 if node:
                     self.canvas.itemconfig(node.circle_id, fill=color)  # Color the node's circle
 
+    def color_centrality(self):
+        """Color nodes from lightblue (lowest score) to red (highest) by the selected centrality."""
+        from matrix import centrality  # Needs numpy and scipy, so only import it when used
+        scores = centrality(self.graph, self.centrality_var.get())
+        if not scores:
+            return
+        low, high = min(scores.values()), max(scores.values())
+        for node_id, score in scores.items():
+            node = self.nodes.get(node_id)
+            if node:
+                t = (score - low) / (high - low) if high > low else 1.0
+                red, green, blue = (round(a + (b - a) * t) for a, b in zip((173, 216, 230), (255, 0, 0)))
+                self.canvas.itemconfig(node.circle_id, fill=f"#{red:02x}{green:02x}{blue:02x}")
+
     def color_topological_sort(self):
         topological_order = self.graph.topological_sort()
         self.highlight_nodes(topological_order)
@@ -468,17 +495,10 @@ class GraphGUI:
             for child in tree["children"]:
                 child_id = child["id"]
                 child_x, child_y = positions[child_id]
-                dx = child_x - x
-                dy = child_y - y
-                distance = math.sqrt(dx ** 2 + dy ** 2)
-                if distance == 0:
+                endpoints = trim_edge(x, y, child_x, child_y, self.node_radius)
+                if endpoints is None:
                     continue
-                unit_dx = dx / distance
-                unit_dy = dy / distance
-                x1_end = x + unit_dx * self.node_radius
-                y1_end = y + unit_dy * self.node_radius
-                x2_end = child_x - unit_dx * self.node_radius
-                y2_end = child_y - unit_dy * self.node_radius
+                x1_end, y1_end, x2_end, y2_end = endpoints
                 canvas.create_line(
                     x1_end, y1_end, x2_end, y2_end,
                     fill="black", width=2, arrow=tk.LAST
@@ -0,0 +1,92 @@
+import time
+from collections import deque
+
+
+class FrameScheduler:
+    """Coalesce canvas work into at most one update per frame, driven by after()."""
+
+    def __init__(self, widget, frame_ms=16, history=600):
+        self.widget = widget
+        self.frame_ms = frame_ms
+        self.after_id = None
+        self.callbacks = {}  # Latest callback per key, run once at the next frame
+        self.pending_coords = {}  # Latest coordinates per canvas item
+        self.pending_config = {}  # Merged options per canvas item
+        self.flushing = False
+        self.frames = 0
+        self.requests = 0
+        self.coalesced = 0  # Requests replaced by a later one before their frame ran
+        self.pending_requests = 0
+        self.frame_times = deque(maxlen=history)  # Durations of the most recent frames
+
+    def request(self, key, callback):
+        """Run callback at the next frame; a later request with the same key replaces it."""
+        self.callbacks[key] = callback
+        self.requests += 1
+        self.pending_requests += 1
+        self.schedule()
+
+    def coords(self, item, *coords):
+        """Queue a canvas.coords() call; only the last coordinates per item are applied."""
+        self.pending_coords[item] = coords
+        self.schedule()
+
+    def itemconfig(self, item, **options):
+        """Queue a canvas.itemconfig() call; options for the same item are merged."""
+        self.pending_config.setdefault(item, {}).update(options)
+        self.schedule()
+
+    def schedule(self):
+        # Work queued while flushing is applied by that same flush, so it needs no new frame
+        if self.after_id is None and not self.flushing:
+            self.after_id = self.widget.after(self.frame_ms, self._on_frame)
+
+    def _on_frame(self):
+        self.after_id = None
+        self.flush()
+
+    def flush(self):
+        """Run the queued callbacks and apply the queued canvas changes now."""
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+        if not (self.callbacks or self.pending_coords or self.pending_config):
+            return
+        start = time.perf_counter()
+        self.flushing = True
+        try:
+            callbacks, self.callbacks = self.callbacks, {}
+            self.coalesced += self.pending_requests - len(callbacks)
+            self.pending_requests = 0
+            for callback in callbacks.values():
+                callback()
+            pending_coords, self.pending_coords = self.pending_coords, {}
+            for item, coords in pending_coords.items():
+                self.widget.coords(item, *coords)
+            pending_config, self.pending_config = self.pending_config, {}
+            for item, options in pending_config.items():
+                self.widget.itemconfig(item, **options)
+        finally:
+            self.flushing = False
+        self.frames += 1
+        self.frame_times.append(time.perf_counter() - start)
+        if self.callbacks:
+            self.schedule()  # A callback requested another one for the next frame
+
+    def stats(self):
+        """Return frame counts and the frame times of the most recent frames, in milliseconds."""
+        stats = {"frames": self.frames, "events": self.requests, "coalesced": self.coalesced}
+        if self.frame_times:
+            times = sorted(self.frame_times)
+            stats.update(
+                mean_ms=sum(times) / len(times) * 1000,
+                p95_ms=times[min(int(len(times) * 0.95), len(times) - 1)] * 1000,
+                max_ms=times[-1] * 1000,
+            )
+        return stats
+
+    def reset_stats(self):
+        self.frames = 0
+        self.requests = 0
+        self.coalesced = 0
+        self.frame_times.clear()
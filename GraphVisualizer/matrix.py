@@ -0,0 +1,184 @@
+from itertools import chain
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+
+from graph import Graph
+
+
+def to_csr(graph, dtype=np.float64):
+    """Return (matrix, nodes): the adjacency matrix in CSR form and the node id of every row.
+
+    Rows follow the insertion order of graph.adjacency_list. The index arrays are filled straight
+    from the adjacency lists, without building intermediate Python lists. An undirected graph
+    stores each edge in both directions, so its matrix is symmetric.
+    """
+    nodes = list(graph.adjacency_list)
+    index = {node: i for i, node in enumerate(nodes)}
+    lengths = np.fromiter(map(len, graph.adjacency_list.values()), dtype=np.int64, count=len(nodes))
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=indptr[1:])
+    indices = np.fromiter(map(index.__getitem__, chain.from_iterable(graph.adjacency_list.values())),
+                          dtype=np.int64, count=int(indptr[-1]))
+    data = np.ones(len(indices), dtype=dtype)
+    matrix = sparse.csr_matrix((data, indices, indptr), shape=(len(nodes), len(nodes)))
+    matrix.sort_indices()
+    return matrix, nodes
+
+
+def to_edge_array(graph):
+    """Return (edges, nodes): an (m, 2) array of (row, column) node indices and the node ids."""
+    matrix, nodes = to_csr(graph)
+    return csr_to_edge_array(matrix), nodes
+
+
+def csr_to_edge_array(matrix):
+    """Return the (m, 2) array of (row, column) indices of the stored entries of a CSR matrix."""
+    rows = np.repeat(np.arange(matrix.shape[0], dtype=matrix.indices.dtype), np.diff(matrix.indptr))
+    return np.column_stack((rows, matrix.indices))
+
+
+def from_edge_array(edges, nodes=None, directed=True):
+    """Build a Graph from an (m, 2) array of node indices."""
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)  # An empty list has no second axis
+    count = len(nodes) if nodes is not None else (int(edges.max()) + 1 if edges.size else 0)
+    matrix = sparse.csr_matrix((np.ones(len(edges)), (edges[:, 0], edges[:, 1])), shape=(count, count))
+    return from_csr(matrix, nodes, directed)
+
+
+def from_csr(matrix, nodes=None, directed=True):
+    """Build a Graph from a sparse adjacency matrix; every stored entry becomes an edge.
+
+    nodes gives the id of every row (0..n-1 by default); explicit zeros are edges too. For an
+    undirected graph the structure is symmetrized first, so an entry in either direction gives an
+    edge.
+    """
+    matrix = sparse.csr_matrix(matrix)
+    # Only the sparsity structure matters: with all-ones data, adding the transpose or summing
+    # duplicates cannot cancel an entry out, and the caller's arrays are never reordered in place
+    matrix = sparse.csr_matrix((np.ones(matrix.nnz, dtype=np.int8), matrix.indices.copy(), matrix.indptr.copy()),
+                               shape=matrix.shape)
+    if not directed:
+        matrix = (matrix + matrix.T).tocsr()
+    matrix.sum_duplicates()
+    graph = Graph(directed=directed)
+    if nodes is None:
+        nodes = range(matrix.shape[0])
+        targets = matrix.indices.tolist()
+    else:
+        nodes = list(nodes)
+        targets = [nodes[i] for i in matrix.indices.tolist()]
+    # Fill the adjacency lists directly; add_edge's duplicate check is quadratic in the degree
+    bounds = matrix.indptr.tolist()
+    for row, node in enumerate(nodes):
+        graph.nodes.add(node)
+        graph.adjacency_list[node] = targets[bounds[row]:bounds[row + 1]]
+    return graph
+
+
+def degrees(matrix):
+    """Return (out_degree, in_degree) arrays of an adjacency matrix."""
+    matrix = sparse.csr_matrix(matrix)
+    out_degree = np.diff(matrix.indptr)
+    in_degree = np.bincount(matrix.indices, minlength=matrix.shape[0])
+    return out_degree, in_degree
+
+
+def degree_statistics(matrix):
+    """Summarize the out- and in-degree distributions of an adjacency matrix."""
+    summary = {}
+    for name, values in zip(("out", "in"), degrees(matrix)):
+        if len(values) == 0:
+            summary[name] = {}
+            continue
+        summary[name] = {
+            "min": int(values.min()),
+            "max": int(values.max()),
+            "mean": float(values.mean()),
+            "median": float(np.median(values)),
+            "std": float(values.std()),
+        }
+    return summary
+
+
+def pagerank(matrix, damping=0.85, tol=1e-6, max_iter=100):
+    """PageRank by power iteration. Dangling nodes spread their rank evenly over all nodes."""
+    matrix = sparse.csr_matrix(matrix, dtype=np.float64)
+    n = matrix.shape[0]
+    if n == 0:
+        return np.zeros(0)
+    out_degree = np.asarray(matrix.sum(axis=1)).ravel()
+    dangling = out_degree == 0
+    inverse_out = np.divide(1.0, out_degree, out=np.zeros(n), where=~dangling)
+    transposed = matrix.T.tocsr()
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        previous = rank
+        rank = damping * (transposed @ (previous * inverse_out) + previous[dangling].sum() / n) + (1 - damping) / n
+        if np.abs(rank - previous).sum() < n * tol:
+            break
+    return rank
+
+
+def eigenvector_centrality(matrix, tol=1e-6, max_iter=100):
+    """Eigenvector centrality by power iteration on incoming edges, normalized to unit length.
+
+    The iteration uses A + I, which has the same leading eigenvector but also converges on
+    bipartite graphs.
+    """
+    matrix = sparse.csr_matrix(matrix, dtype=np.float64)
+    n = matrix.shape[0]
+    if n == 0:
+        return np.zeros(0)
+    transposed = matrix.T.tocsr()
+    centrality = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        previous = centrality
+        centrality = transposed @ previous + previous
+        norm = np.linalg.norm(centrality)
+        if norm == 0:
+            return centrality
+        centrality /= norm
+        if np.abs(centrality - previous).sum() < n * tol:
+            break
+    return centrality
+
+
+def closeness_centrality(matrix, batch_size=256):
+    """Closeness centrality from unweighted shortest paths into every node.
+
+    Nodes that cannot reach everything are scaled by the fraction of nodes that can reach them
+    (Wasserman and Faust). This needs one BFS per node, so it is far more expensive than the
+    other measures; sources are processed in batches to keep memory at batch_size * n.
+    """
+    matrix = sparse.csr_matrix(matrix)
+    n = matrix.shape[0]
+    closeness = np.zeros(n)
+    if n < 2:
+        return closeness
+    transposed = matrix.T.tocsr()  # Distances to a node are distances from it on the reversed graph
+    for first in range(0, n, batch_size):
+        sources = np.arange(first, min(first + batch_size, n))
+        distances = csgraph.shortest_path(transposed, unweighted=True, indices=sources)
+        reachable = np.isfinite(distances)
+        total = np.where(reachable, distances, 0).sum(axis=1)
+        count = reachable.sum(axis=1) - 1
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.where(total > 0, count / total * count / (n - 1), 0.0)
+        closeness[sources] = scores
+    return closeness
+
+
+CENTRALITY_MEASURES = {
+    "Degree": lambda matrix: degrees(matrix)[1] / max(matrix.shape[0] - 1, 1),
+    "PageRank": pagerank,
+    "Eigenvector": eigenvector_centrality,
+    "Closeness": closeness_centrality,
+}
+
+
+def centrality(graph, measure):
+    """Return {node_id: score} for one of CENTRALITY_MEASURES."""
+    matrix, nodes = to_csr(graph)
+    return dict(zip(nodes, CENTRALITY_MEASURES[measure](matrix).tolist()))
@@ -0,0 +1,302 @@
+import multiprocessing
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import chain
+from multiprocessing import shared_memory
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+
+# State each worker process gets once, from the pool initializer
+_arrays = {}  # Shared int64 arrays, keyed by name
+_blocks = []
+_graph = {}  # Adjacency lists, node ids and their indices, for converting node ranges
+
+
+def _init_worker(names, adjacency_list, nodes, index):
+    """Attach to the shared arrays and keep the graph for converting node ranges."""
+    for key, (name, length) in names.items():
+        block = shared_memory.SharedMemory(name=name)
+        _blocks.append(block)  # Keep the block open for as long as the worker lives
+        _arrays[key] = np.ndarray(length, dtype=np.int64, buffer=block.buf)
+    _graph.update(adjacency_list=adjacency_list, nodes=nodes, index=index)
+
+
+class _SharedArrays:
+    """Own a set of shared int64 arrays for the lifetime of a pool."""
+
+    def __init__(self, **lengths):
+        self.blocks = {key: shared_memory.SharedMemory(create=True, size=max(length, 1) * 8)
+                       for key, length in lengths.items()}
+        self.names = {key: (self.blocks[key].name, length) for key, length in lengths.items()}
+        self.arrays = {key: np.ndarray(length, dtype=np.int64, buffer=self.blocks[key].buf)
+                       for key, length in lengths.items()}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.arrays.clear()
+        for block in self.blocks.values():
+            block.close()
+            block.unlink()
+
+
+def _pool(graph, processes, shared, nodes, index):
+    """Start a pool whose workers share the arrays and, with fork, inherit the graph without a copy.
+
+    fork is only used on Linux. macOS lists it too, but forking after numpy/scipy have started
+    system threads can crash or hang the workers, so there the default (spawn) pickles the graph.
+    """
+    context = multiprocessing.get_context("fork") if sys.platform.startswith("linux") else None
+    return ProcessPoolExecutor(processes, mp_context=context, initializer=_init_worker,
+                               initargs=(shared.names, graph.adjacency_list, nodes, index))
+
+
+def _index_nodes(graph):
+    """Return the node ids and a map from id to row, or None when the ids are already 0..n-1 in order."""
+    nodes = list(graph.adjacency_list)
+    if nodes == list(range(len(nodes))):
+        return nodes, None
+    return nodes, {node: i for i, node in enumerate(nodes)}
+
+
+def _ranges(indptr, parts):
+    """Split the nodes into up to `parts` contiguous ranges holding about the same number of edges."""
+    cuts = np.searchsorted(indptr, np.linspace(0, indptr[-1], parts + 1)[1:-1])
+    bounds = np.unique(np.concatenate(([0], cuts, [len(indptr) - 1])))
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
+def _group(nodes, labels):
+    """Turn a label per node index into components, both ordered by insertion order."""
+    if len(labels) == 0:
+        return []
+    order = np.argsort(labels, kind="stable")
+    starts = np.flatnonzero(np.diff(labels[order])) + 1
+    groups = np.split(order, starts)
+    firsts = order[np.concatenate(([0], starts))]
+    node_ids = np.empty(len(nodes), dtype=object)
+    node_ids[:] = nodes
+    return [node_ids[groups[i]].tolist() for i in np.argsort(firsts)]
+
+
+def _convert_range(first, last, components):
+    """Fill the shared CSR indices for nodes [first, last) from their adjacency lists.
+
+    With components=True, also label the connected components of just these edges and return
+    the (node, representative) pairs of the touched nodes that are not their own representative.
+    """
+    indptr, indices = _arrays["forward_indptr"], _arrays["forward_indices"]
+    low, high = int(indptr[first]), int(indptr[last])
+    neighbors = chain.from_iterable(map(_graph["adjacency_list"].__getitem__, _graph["nodes"][first:last]))
+    if _graph["index"] is not None:
+        neighbors = map(_graph["index"].__getitem__, neighbors)
+    indices[low:high] = np.fromiter(neighbors, dtype=np.int64, count=high - low)
+    if not components:
+        return None
+
+    rows = np.repeat(np.arange(first, last), np.diff(indptr[first:last + 1]))
+    # Relabel to the touched nodes only, so the work does not depend on the size of the graph
+    touched, compact = np.unique(np.concatenate((rows, indices[low:high])), return_inverse=True)
+    local = sparse.coo_matrix((np.ones(high - low, dtype=np.int8), (compact[:high - low], compact[high - low:])),
+                              shape=(len(touched), len(touched)))
+    _, local_labels = csgraph.connected_components(local, directed=True, connection="weak")
+    # touched is sorted, so the first member of each local component is its smallest node
+    _, first_member = np.unique(local_labels, return_index=True)
+    representative = touched[first_member][local_labels]
+    joined = touched != representative
+    return touched[joined], representative[joined]
+
+
+def parallel_connected_components(graph, processes=None):
+    """Find connected components by labeling edge partitions on a process pool and merging them.
+
+    Each worker converts the adjacency lists of a range of nodes into shared memory and labels
+    the components of those edges alone; the partial forests are then joined in one pass.
+    Edges are treated as undirected, so for a directed graph these are its weakly connected
+    components. For an undirected graph the partition is the same as find_connected_components().
+
+    This is not a faster replacement for find_connected_components(): converting string node ids
+    costs more than the serial DFS itself, and on one core it measured 0.4-0.6x the serial speed
+    (see bench_components.py). Use it for graphs too deep for the recursive DFS, or where a
+    multi-core run of the benchmark shows a gain.
+    """
+    processes = processes or os.cpu_count()
+    nodes, index = _index_nodes(graph)
+    degrees = np.fromiter(map(len, graph.adjacency_list.values()), dtype=np.int64, count=len(nodes))
+    edge_count = int(degrees.sum())
+
+    with _SharedArrays(forward_indptr=len(nodes) + 1, forward_indices=edge_count) as shared:
+        indptr = shared.arrays["forward_indptr"]
+        indptr[0] = 0
+        np.cumsum(degrees, out=indptr[1:])
+        pairs = []
+        if edge_count:
+            with _pool(graph, processes, shared, nodes, index) as pool:
+                results = [pool.submit(_convert_range, first, last, True)
+                           for first, last in _ranges(indptr, processes)]
+                pairs = [result.result() for result in results]
+        del indptr
+
+    # Merge step: every (node, representative) pair is one union in the global forest
+    sources = np.concatenate([pair[0] for pair in pairs] or [np.zeros(0, dtype=np.int64)])
+    targets = np.concatenate([pair[1] for pair in pairs] or [np.zeros(0, dtype=np.int64)])
+    forest = sparse.coo_matrix((np.ones(len(sources), dtype=np.int8), (sources, targets)),
+                               shape=(len(nodes), len(nodes)))
+    _, labels = csgraph.connected_components(forest, directed=True, connection="weak")
+    return _group(nodes, labels)
+
+
+def _neighbors(indptr, indices, frontier):
+    """Return the concatenated neighbor lists of the frontier nodes."""
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return indices[offsets + np.arange(int(counts.sum()))]
+
+
+def _reach(pivot, label, direction):
+    """Return the nodes with the given label reachable from pivot along forward or reverse edges."""
+    indptr, indices = _arrays[direction + "_indptr"], _arrays[direction + "_indices"]
+    labels = _arrays["labels"]
+    seen = np.zeros(len(labels), dtype=bool)
+    seen[pivot] = True
+    frontier = np.array([pivot])
+    while len(frontier):
+        found = _neighbors(indptr, indices, frontier)
+        found = np.unique(found[(labels[found] == label) & ~seen[found]])
+        seen[found] = True
+        frontier = found
+    return np.flatnonzero(seen)
+
+
+def _solve_part(part, label):
+    """Find the SCCs of the subgraph induced by a small subproblem; return a local label per node."""
+    indptr, indices, labels = _arrays["forward_indptr"], _arrays["forward_indices"], _arrays["labels"]
+    counts = indptr[part + 1] - indptr[part]
+    rows = np.repeat(np.arange(len(part)), counts)
+    targets = _neighbors(indptr, indices, part)
+    inside = labels[targets] == label  # Every node of the part, and only those, carries its label
+    local = sparse.coo_matrix((np.ones(int(inside.sum()), dtype=np.int8),
+                               (rows[inside], np.searchsorted(part, targets[inside]))),
+                              shape=(len(part), len(part)))
+    _, local_labels = csgraph.connected_components(local, directed=True, connection="strong")
+    return local_labels
+
+
+def _trim(indptr, indices, backward_indptr, backward_indices, rounds):
+    """Drop nodes with no remaining in- or out-edges for a few rounds; each is an SCC on its own.
+
+    Return the alive mask and the trimmed nodes in the order they were removed.
+    """
+    n = len(indptr) - 1
+    alive = np.ones(n, dtype=bool)
+    out_degree = np.diff(indptr)
+    in_degree = np.diff(backward_indptr)
+    trimmed = []
+    for _ in range(rounds):
+        dead = np.flatnonzero(alive & ((out_degree == 0) | (in_degree == 0)))
+        if not len(dead):
+            break
+        alive[dead] = False
+        trimmed.append(dead)
+        in_degree = in_degree - np.bincount(_neighbors(indptr, indices, dead), minlength=n)
+        out_degree = out_degree - np.bincount(_neighbors(backward_indptr, backward_indices, dead), minlength=n)
+    return alive, np.concatenate(trimmed) if trimmed else np.zeros(0, dtype=np.int64)
+
+
+def _forward_backward(shared, pool, small, trim_rounds):
+    """Run trimming and the forward-backward decomposition; return the SCC label of every node."""
+    arrays = shared.arrays
+    labels = arrays["labels"]
+    alive, trimmed = _trim(arrays["forward_indptr"], arrays["forward_indices"],
+                           arrays["backward_indptr"], arrays["backward_indices"], trim_rounds)
+    # Labels are >= 0 for an open subproblem and -1 - k once a node is in SCC k
+    labels[:] = 0
+    labels[trimmed] = -1 - np.arange(len(trimmed))
+    state = {"next_scc": len(trimmed), "next_label": 1}
+    pending = {}
+    reached = {}
+    members = {}
+
+    def open_subproblem(part):
+        if len(part) == 0:
+            return
+        if len(part) == 1:
+            labels[part] = -1 - state["next_scc"]
+            state["next_scc"] += 1
+            return
+        label = state["next_label"]
+        state["next_label"] += 1
+        labels[part] = label
+        members[label] = part
+        if len(part) <= small:
+            pending[pool.submit(_solve_part, part, label)] = (label, "solve")
+        else:
+            for direction in ("forward", "backward"):
+                pending[pool.submit(_reach, int(part[0]), label, direction)] = (label, direction)
+
+    def split(label):
+        searches = reached.pop(label)
+        part = members.pop(label)
+        in_forward = np.isin(part, searches["forward"], assume_unique=True)
+        in_backward = np.isin(part, searches["backward"], assume_unique=True)
+        labels[part[in_forward & in_backward]] = -1 - state["next_scc"]
+        state["next_scc"] += 1
+        open_subproblem(part[in_forward & ~in_backward])
+        open_subproblem(part[in_backward & ~in_forward])
+        open_subproblem(part[~in_forward & ~in_backward])
+
+    open_subproblem(np.flatnonzero(alive))
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            label, kind = pending.pop(future)
+            if kind == "solve":
+                local_labels = future.result()
+                labels[members.pop(label)] = -1 - (state["next_scc"] + local_labels)
+                state["next_scc"] += int(local_labels.max()) + 1
+                continue
+            reached.setdefault(label, {})[kind] = future.result()
+            if len(reached[label]) == 2:
+                split(label)
+    return -1 - labels
+
+
+def parallel_scc(graph, processes=None, small=None, trim_rounds=10):
+    """Find strongly connected components with forward-backward decomposition on a process pool.
+
+    The workers first convert the adjacency lists into a shared CSR matrix. Nodes that cannot be
+    on a cycle are then trimmed, and for every open subproblem the forward and backward reachable
+    sets of a pivot are computed in parallel; their intersection is an SCC and the three leftover
+    parts become independent subproblems. Subproblems of at most `small` nodes are solved whole
+    by a worker. The partition is the same as kosaraju(); components are listed in insertion order.
+    """
+    processes = processes or os.cpu_count()
+    nodes, index = _index_nodes(graph)
+    n = len(nodes)
+    if small is None:
+        small = max(4096, n // (4 * processes))
+    degrees = np.fromiter(map(len, graph.adjacency_list.values()), dtype=np.int64, count=n)
+    edge_count = int(degrees.sum())
+
+    with _SharedArrays(forward_indptr=n + 1, forward_indices=edge_count, labels=n,
+                       backward_indptr=n + 1, backward_indices=edge_count) as shared, \
+            _pool(graph, processes, shared, nodes, index) as pool:
+        arrays = shared.arrays
+        arrays["forward_indptr"][0] = 0
+        np.cumsum(degrees, out=arrays["forward_indptr"][1:])
+        for result in [pool.submit(_convert_range, first, last, False)
+                       for first, last in _ranges(arrays["forward_indptr"], processes)]:
+            result.result()
+        # The reversed graph's CSR is the forward graph's CSC
+        backward = sparse.csr_matrix((np.ones(edge_count, dtype=np.int8), arrays["forward_indices"],
+                                      arrays["forward_indptr"]), shape=(n, n)).tocsc()
+        arrays["backward_indptr"][:] = backward.indptr
+        arrays["backward_indices"][:] = backward.indices
+        del backward, arrays
+        labels = _forward_backward(shared, pool, small, trim_rounds)
+    return _group(nodes, labels)
@@ -0,0 +1,359 @@
+import math
+import random
+import struct
+import zlib
+from multiprocessing import Pool
+from xml.sax.saxutils import escape, quoteattr
+
+from edge import trim_edge
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for raster (PNG) output
+    np = None
+
+# Same palette the GUI uses when coloring components
+COMPONENT_COLORS = ["red", "green", "blue", "yellow", "purple", "orange", "pink", "cyan"]
+
+# Tk resolves color names with the X11 table, so use its values to match the GUI
+NAMED_COLORS = {
+    "black": "#000000",
+    "white": "#ffffff",
+    "lightblue": "#add8e6",
+    "red": "#ff0000",
+    "green": "#00ff00",
+    "blue": "#0000ff",
+    "yellow": "#ffff00",
+    "purple": "#a020f0",
+    "orange": "#ffa500",
+    "pink": "#ffc0cb",
+    "cyan": "#00ffff",
+}
+
+# Tk's default arrowshape for create_line(arrow=tk.LAST)
+ARROW_SHAPE = (8, 10, 3)
+
+# Upper bound on pixels rasterized at once, to keep memory flat on huge graphs
+RASTER_CHUNK = 1 << 22
+
+
+def to_hex(color):
+    """Return the #rrggbb form of a Tk color name or hex string."""
+    if color.startswith("#"):
+        return color.lower()
+    return NAMED_COLORS.get(color.lower(), color)
+
+
+def to_rgb(color):
+    """Return an (r, g, b) tuple for a Tk color name or hex string."""
+    value = to_hex(color)
+    if not value.startswith("#") or len(value) != 7:
+        raise ValueError(f"Unknown color: {color}")
+    return tuple(int(value[i:i + 2], 16) for i in (1, 3, 5))
+
+
+def component_coloring(components, colors=None):
+    """Map every node to the color of its component, the same way the GUI colors components."""
+    colors = list(colors or COMPONENT_COLORS)
+    while len(colors) < len(components):
+        colors.append(f"#{random.randint(0, 0xFFFFFF):06x}")  # Add random colors if needed
+    return {node_id: colors[idx] for idx, component in enumerate(components) for node_id in component}
+
+
+def circular_layout(graph, width, height, margin=40):
+    """Place the nodes evenly on a circle that fits the image."""
+    nodes = list(graph.adjacency_list)
+    radius = max(min(width, height) / 2 - margin, 0)
+    cx, cy = width / 2, height / 2
+    step = 2 * math.pi / max(len(nodes), 1)
+    return {node: (cx + radius * math.cos(i * step), cy + radius * math.sin(i * step))
+            for i, node in enumerate(nodes)}
+
+
+class GraphRenderer:
+    """Render a graph to SVG or PNG without a display, using the same geometry as GraphGUI.
+
+    Like GraphGUI.draw_graph, nodes are drawn first and edges on top of them.
+    """
+
+    def __init__(self, graph, positions=None, width=800, height=600, node_radius=20,
+                 node_colors=None, default_color="lightblue", edge_width=2, labels=True):
+        self.graph = graph
+        self.width = width
+        self.height = height
+        self.node_radius = node_radius
+        self.positions = positions if positions is not None else circular_layout(graph, width, height)
+        self.node_colors = node_colors or {}
+        self.default_color = default_color
+        self.edge_width = edge_width
+        self.labels = labels
+
+    @classmethod
+    def from_gui(cls, gui, **options):
+        """Create a renderer for what a GraphGUI currently shows."""
+        options.setdefault("width", int(gui.canvas["width"]))
+        options.setdefault("height", int(gui.canvas["height"]))
+        options.setdefault("node_radius", gui.node_radius)
+        positions = {node_id: (node.x, node.y) for node_id, node in gui.nodes.items()}
+        return cls(gui.graph, positions, **options)
+
+    def iter_edges(self):
+        """Yield each drawable edge once (undirected edges are stored in both directions)."""
+        order = {node: i for i, node in enumerate(self.graph.adjacency_list)}
+        for node, neighbors in self.graph.adjacency_list.items():
+            for neighbor in neighbors:
+                if self.graph.directed or order[node] < order[neighbor]:
+                    yield node, neighbor
+
+    def render(self, path):
+        """Render to a file, choosing the format from its extension."""
+        if path.lower().endswith(".svg"):
+            self.render_svg(path)
+        elif path.lower().endswith(".png"):
+            self.render_png(path)
+        else:
+            raise ValueError(f"Unsupported output format: {path}")
+
+    def render_svg(self, path, batch_size=10000):
+        """Write an SVG file, streaming elements so the whole document is never held in memory."""
+        with open(path, "w", encoding="utf-8") as out:
+            out.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{self.width}" height="{self.height}" '
+                      f'viewBox="0 0 {self.width} {self.height}">\n')
+            out.write('<rect width="100%" height="100%" fill="white"/>\n')
+            if self.graph.directed:
+                shape_a, shape_b, shape_c = ARROW_SHAPE
+                shape_c += self.edge_width / 2
+                out.write('<defs><marker id="arrow" markerUnits="userSpaceOnUse" orient="auto" '
+                          f'refX="{shape_b}" refY="0" overflow="visible">'
+                          f'<path d="M{shape_b},0 L0,{-shape_c} L{shape_b - shape_a},0 L0,{shape_c} z" '
+                          'fill="black"/></marker></defs>\n')
+
+            # Nodes first and edges on top, in the same order as GraphGUI.draw_graph
+            out.write('<g stroke="black" stroke-width="2" font-family="Arial" font-size="12" '
+                      'text-anchor="middle" dominant-baseline="central">\n')
+            batch = []
+            for node in self.graph.adjacency_list:
+                x, y = self.positions[node]
+                fill = to_hex(self.node_colors.get(node, self.default_color))
+                batch.append(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{self.node_radius}" fill={quoteattr(fill)}/>\n')
+                if self.labels:
+                    label = escape(str(node).split('_')[-1])
+                    batch.append(f'<text x="{x:.1f}" y="{y:.1f}" stroke="none">{label}</text>\n')
+                if len(batch) >= batch_size:
+                    out.write("".join(batch))
+                    batch.clear()
+            out.write("".join(batch))
+            out.write("</g>\n")
+
+            if self.graph.directed:
+                out.write(f'<g stroke="black" stroke-width="{self.edge_width}" marker-end="url(#arrow)">\n')
+            else:
+                out.write(f'<g stroke="black" stroke-width="{self.edge_width}">\n')
+            batch = []
+            for start, end in self.iter_edges():
+                x1, y1 = self.positions[start]
+                x2, y2 = self.positions[end]
+                endpoints = trim_edge(x1, y1, x2, y2, self.node_radius)
+                if endpoints is None:
+                    continue
+                batch.append('<line x1="%.1f" y1="%.1f" x2="%.1f" y2="%.1f"/>\n' % endpoints)
+                if len(batch) >= batch_size:
+                    out.write("".join(batch))
+                    batch.clear()
+            out.write("".join(batch))
+            out.write("</g>\n</svg>\n")
+
+    def render_png(self, path):
+        """Write a PNG file. Geometry is rasterized with numpy; labels are not drawn."""
+        write_png(path, self.rasterize())
+
+    def rasterize(self):
+        """Return the drawing as a (height, width, 3) uint8 array."""
+        if np is None:
+            raise ImportError("numpy is required for raster output")
+        image = np.full((self.height, self.width, 3), 255, dtype=np.uint8)
+        nodes = list(self.graph.adjacency_list)
+        if not nodes:
+            return image
+        index = {node: i for i, node in enumerate(nodes)}
+        coords = np.array([self.positions[node] for node in nodes], dtype=np.float64)
+
+        edges = np.array([(index[start], index[end]) for start, end in self.iter_edges()],
+                         dtype=np.int64).reshape(-1, 2)
+        start, end = coords[edges[:, 0]], coords[edges[:, 1]]
+        delta = end - start
+        distance = np.hypot(delta[:, 0], delta[:, 1])
+        keep = distance > 0
+        start, end, delta, distance = start[keep], end[keep], delta[keep], distance[keep]
+        # Same trimming as trim_edge: stop the lines at the outer edge of the nodes
+        unit = delta / distance[:, None]
+        start = start + unit * self.node_radius
+        end = end - unit * self.node_radius
+        fills = np.array([to_rgb(self.node_colors.get(node, self.default_color)) for node in nodes],
+                         dtype=np.uint8)
+        # Nodes first and edges on top, in the same order as GraphGUI.draw_graph
+        _raster_nodes(image, coords, self.node_radius, fills)
+
+        # Edges and arrowheads share one color, so mark them in a mask and paint it once.
+        # The mask has a margin so arrowheads crossing the border are drawn whole.
+        shape_a, shape_b, shape_c = ARROW_SHAPE
+        shape_c += self.edge_width / 2
+        reach = math.hypot(shape_b, shape_c)  # Farthest an arrowhead point lies from its tip
+        margin = int(math.ceil(reach)) + self.edge_width
+        ink = np.zeros((self.height + 2 * margin, self.width + 2 * margin), dtype=bool)
+        _raster_lines(ink, start, end, self.edge_width, margin)
+
+        if self.graph.directed:
+            # Skip arrowheads too far off the image to touch it
+            near = ((end[:, 0] > -reach) & (end[:, 0] < self.width + reach) &
+                    (end[:, 1] > -reach) & (end[:, 1] < self.height + reach))
+            tip, unit = end[near] + margin, unit[near]
+            normal = np.column_stack((-unit[:, 1], unit[:, 0]))
+            back = tip - unit * shape_b
+            left = back + normal * shape_c
+            neck = tip - unit * shape_a
+            right = back - normal * shape_c
+            _raster_triangles(ink, tip, left, neck)
+            _raster_triangles(ink, tip, neck, right)
+        image[ink[margin:margin + self.height, margin:margin + self.width]] = 0
+        return image
+
+
+def _flat_pixels(shape, xs, ys):
+    """Return the flat indices of the in-bounds pixels nearest to (xs, ys), and which points they are."""
+    height, width = shape[:2]
+    xs = np.rint(xs).astype(np.int64)
+    ys = np.rint(ys).astype(np.int64)
+    inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+    return ys[inside] * width + xs[inside], inside
+
+
+def _clip_segments(start, end, width, height):
+    """Clip segments to the pixel grid [0, width - 1] x [0, height - 1] (Liang-Barsky).
+
+    Return the clipped start and end points of the segments that touch the image.
+    """
+    delta = end - start
+    t0 = np.zeros(len(start))
+    t1 = np.ones(len(start))
+    keep = np.ones(len(start), dtype=bool)
+    for p, q in ((-delta[:, 0], start[:, 0]), (delta[:, 0], width - 1 - start[:, 0]),
+                 (-delta[:, 1], start[:, 1]), (delta[:, 1], height - 1 - start[:, 1])):
+        parallel = p == 0
+        keep &= ~(parallel & (q < 0))  # Parallel to this border and outside it
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = q / p
+        t0 = np.where(p < 0, np.maximum(t0, ratio), t0)
+        t1 = np.where(p > 0, np.minimum(t1, ratio), t1)
+    keep &= t0 <= t1
+    start, delta, t0, t1 = start[keep], delta[keep], t0[keep], t1[keep]
+    return start + delta * t0[:, None], start + delta * t1[:, None]
+
+
+def _raster_lines(ink, start, end, width, margin):
+    """Mark line segments with one sample per pixel along their major axis.
+
+    The segments are clipped to the image inside the mask's margin. Then they are sorted by
+    length and stepped together, so every step is one vectorized pass over the segments that
+    are still long enough.
+    """
+    flat_ink = ink.reshape(-1)
+    stride = ink.shape[1]
+    start, end = _clip_segments(start, end, stride - 2 * margin, ink.shape[0] - 2 * margin)
+    delta = end - start
+    counts = np.ceil(np.abs(delta).max(axis=1)).astype(np.int64) + 1
+    order = np.argsort(-counts, kind="stable")
+    counts = counts[order]
+    steps = delta[order] / np.maximum(counts - 1, 1)[:, None]
+    # Shift to mask coordinates and pre-add 0.5 so truncation rounds to the nearest pixel
+    x, y = (start[order] + margin + 0.5).T.copy()
+    step_x, step_y = steps.T.copy()
+    descending = -counts  # Ascending, for searchsorted
+    for step in range(int(counts[0]) if len(counts) else 0):
+        # Segments are sorted longest first, so the ones still drawing are a prefix
+        active = int(np.searchsorted(descending, -step, side="left"))
+        flat_ink[y[:active].astype(np.int64) * stride + x[:active].astype(np.int64)] = True
+        x[:active] += step_x[:active]
+        y[:active] += step_y[:active]
+
+    # Thicken the one-pixel lines to the requested width with shifted copies of the whole mask
+    height_px, width_px = ink.shape
+    thin = ink.copy()
+    for ox in range(width):
+        for oy in range(width):
+            ox_shift, oy_shift = ox - width // 2, oy - width // 2
+            if ox_shift or oy_shift:
+                ink[max(oy_shift, 0):height_px + min(oy_shift, 0), max(ox_shift, 0):width_px + min(ox_shift, 0)] |= \
+                    thin[max(-oy_shift, 0):height_px + min(-oy_shift, 0),
+                         max(-ox_shift, 0):width_px + min(-ox_shift, 0)]
+
+
+def _raster_triangles(ink, a, b, c, steps=12):
+    """Mark triangles by sampling a barycentric lattice fine enough for arrowhead-sized shapes.
+
+    Samples outside the mask are dropped.
+    """
+    flat_ink = ink.reshape(-1)
+    ab, ac = b - a, c - a
+    for i in range(steps + 1):
+        for j in range(steps + 1 - i):
+            points = a + ab * (i / steps) + ac * (j / steps)
+            flat_ink[_flat_pixels(ink.shape, points[:, 0], points[:, 1])[0]] = True
+
+
+def _raster_nodes(image, centers, radius, fills, outline_width=2):
+    """Stamp filled discs with a black outline at every node center."""
+    flat_image = image.reshape(-1, 3)
+    oy, ox = np.mgrid[-radius:radius + 1, -radius:radius + 1]
+    distance = np.hypot(ox, oy)
+    fill_mask = distance <= radius - outline_width
+    ring_mask = (distance <= radius) & ~fill_mask
+    # Skip nodes whose disc does not touch the image
+    height, width = image.shape[:2]
+    visible = ((centers[:, 0] > -radius - 1) & (centers[:, 0] < width + radius) &
+               (centers[:, 1] > -radius - 1) & (centers[:, 1] < height + radius))
+    centers, fills = centers[visible], fills[visible]
+    per_chunk = max(RASTER_CHUNK // ox.size, 1)
+    for first in range(0, len(centers), per_chunk):
+        cx = centers[first:first + per_chunk, 0:1]
+        cy = centers[first:first + per_chunk, 1:2]
+        colors = np.repeat(fills[first:first + per_chunk], int(fill_mask.sum()), axis=0)
+        pixels, inside = _flat_pixels(image.shape, (cx + ox[fill_mask]).ravel(), (cy + oy[fill_mask]).ravel())
+        flat_image[pixels] = colors[inside]
+        pixels, _ = _flat_pixels(image.shape, (cx + ox[ring_mask]).ravel(), (cy + oy[ring_mask]).ravel())
+        flat_image[pixels] = 0
+
+
+def write_png(path, image, rows_per_block=256):
+    """Write an RGB uint8 array as a PNG, compressing it a block of rows at a time."""
+    height, width = image.shape[:2]
+
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    compressor = zlib.compressobj(6)
+    data = []
+    for top in range(0, height, rows_per_block):
+        rows = np.ascontiguousarray(image[top:top + rows_per_block])
+        filtered = np.zeros((rows.shape[0], width * 3 + 1), dtype=np.uint8)  # Filter type 0 per row
+        filtered[:, 1:] = rows.reshape(rows.shape[0], -1)
+        data.append(compressor.compress(filtered.tobytes()))
+    data.append(compressor.flush())
+
+    with open(path, "wb") as out:
+        out.write(b"\x89PNG\r\n\x1a\n")
+        out.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        out.write(chunk(b"IDAT", b"".join(data)))
+        out.write(chunk(b"IEND", b""))
+
+
+def _render_job(job):
+    graph, path, options = job if len(job) == 3 else (*job, {})
+    GraphRenderer(graph, **options).render(path)
+    return path
+
+
+def render_many(jobs, processes=None):
+    """Render many graphs in parallel. Each job is (graph, path) or (graph, path, renderer options)."""
+    with Pool(processes) as pool:
+        return list(pool.imap_unordered(_render_job, jobs))